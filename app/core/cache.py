@@ -0,0 +1,31 @@
+import time
+
+class TTLCache:
+    """Minimal single-value cache with a time-to-live.
+
+    Good enough for hot, rarely-changing responses like the top-notes
+    list; writers call clear() so readers never serve stale data for
+    longer than one write.
+    """
+
+    def __init__(self, ttl: float = 2.0):
+        self.ttl = ttl
+        self._value = None
+        self._expires_at = 0.0
+
+    def get(self):
+        """Return the cached value, or None if missing or expired."""
+        if self._value is not None and time.monotonic() < self._expires_at:
+            return self._value
+        return None
+
+    def set(self, value):
+        self._value = value
+        self._expires_at = time.monotonic() + self.ttl
+
+    def clear(self):
+        self._value = None
+        self._expires_at = 0.0
+
+# Cache for GET /notes/top, invalidated by every write endpoint
+top_notes_cache = TTLCache(ttl=2.0)
@@ -1,38 +1,155 @@
-import sqlite3
+import asyncio
+import aiosqlite
+from fastapi import Request
 
 DATABASE_NAME = "agora.db"
 
-def get_db_connection():
-    """Create a database connection."""
-    conn = sqlite3.connect(DATABASE_NAME, check_same_thread=False)
-    conn.row_factory = sqlite3.Row  # Access columns by name
-    return conn
+# Schema statements shared between app startup and the test fixtures
+# so both always create the exact same tables.
+SCHEMA_STATEMENTS = [
+    '''
+    CREATE TABLE IF NOT EXISTS notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        topic TEXT NOT NULL,
+        content TEXT NOT NULL,
+        author TEXT DEFAULT 'Anonymous',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        votes INTEGER DEFAULT 0,
+        pinned BOOLEAN DEFAULT 0
+    )
+    ''',
+    # Indexes backing the filters in GET /notes (topic, author), its
+    # created_at ordering, and the votes ordering in GET /notes/top.
+    "CREATE INDEX IF NOT EXISTS idx_notes_topic ON notes(topic)",
+    "CREATE INDEX IF NOT EXISTS idx_notes_author ON notes(author)",
+    "CREATE INDEX IF NOT EXISTS idx_notes_created_at ON notes(created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_notes_votes ON notes(votes DESC, id)",
+    # Partial index over the (few) pinned notes so pinned-first listing
+    # finds them without touching the rest of the table.
+    "CREATE INDEX IF NOT EXISTS idx_notes_pinned ON notes(created_at DESC) WHERE pinned = 1",
+    # Full-text index over the notes, kept in sync with the notes table
+    # via the triggers below (FTS5 "external content" pattern).
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+        topic, content, author,
+        content='notes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts(rowid, topic, content, author)
+        VALUES (new.id, new.topic, new.content, new.author);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, topic, content, author)
+        VALUES ('delete', old.id, old.topic, old.content, old.author);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, topic, content, author)
+        VALUES ('delete', old.id, old.topic, old.content, old.author);
+        INSERT INTO notes_fts(rowid, topic, content, author)
+        VALUES (new.id, new.topic, new.content, new.author);
+    END
+    '''
+]
 
-def init_db():
+# Pragmas applied to every connection. WAL lets readers run concurrently
+# with a writer, synchronous=NORMAL cuts fsyncs per commit (still durable
+# enough in WAL mode), and the rest keep hot pages and temp data in memory.
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+]
+
+def dict_row_factory(cursor, row):
+    """Build plain dicts straight from the driver.
+
+    Rows come out ready for the response models, skipping the
+    intermediate sqlite3.Row plus per-row dict(...) conversion the
+    handlers used to do.
+    """
+    return {description[0]: value for description, value in zip(cursor.description, row)}
+
+async def apply_pragmas(conn):
+    """Apply the performance pragmas to a connection."""
+    for pragma in CONNECTION_PRAGMAS:
+        await conn.execute(pragma)
+
+async def init_db():
     """Initialize the database with the notes table."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Create table if it doesn't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            topic TEXT NOT NULL,
-            content TEXT NOT NULL,
-            author TEXT DEFAULT 'Anonymous',
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            votes INTEGER DEFAULT 0,
-            pinned BOOLEAN DEFAULT 0
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-def get_db():
-    """Dependency for database connections."""
-    conn = get_db_connection()
+    async with aiosqlite.connect(DATABASE_NAME) as conn:
+        await apply_pragmas(conn)
+        for statement in SCHEMA_STATEMENTS:
+            await conn.execute(statement)
+        # Backfill the full-text index for rows that predate it
+        await conn.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+        await conn.commit()
+
+class ConnectionPool:
+    """Small pool of long-lived connections: one writer plus N readers.
+
+    SQLite allows a single writer at a time, and in WAL mode readers run
+    concurrently with it. Keeping the connections open for the process
+    lifetime avoids reopening the database (and its WAL/SHM files) on
+    every request.
+    """
+
+    def __init__(self, database: str, readers: int = 4):
+        self.database = database
+        self.reader_count = readers
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._writer: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    async def _connect(self):
+        # A larger statement cache keeps every hot query's prepared plan
+        conn = await aiosqlite.connect(self.database, cached_statements=256)
+        conn.row_factory = dict_row_factory
+        await apply_pragmas(conn)
+        return conn
+
+    async def open(self):
+        """Open the writer and reader connections (called on startup)."""
+        await self._writer.put(await self._connect())
+        for _ in range(self.reader_count):
+            await self._readers.put(await self._connect())
+
+    async def acquire(self, write: bool = False):
+        """Check out a connection, waiting if none is free."""
+        queue = self._writer if write else self._readers
+        return await queue.get()
+
+    async def release(self, conn, write: bool = False):
+        """Return a connection to the pool."""
+        queue = self._writer if write else self._readers
+        await queue.put(conn)
+
+    async def close(self):
+        """Close all pooled connections (called on shutdown)."""
+        for queue in (self._writer, self._readers):
+            while not queue.empty():
+                conn = await queue.get()
+                await conn.close()
+
+pool = ConnectionPool(DATABASE_NAME)
+
+# HTTP methods that must go through the single writer connection
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+async def get_db(request: Request):
+    """Dependency for database connections, checked out from the pool."""
+    write = request.method in WRITE_METHODS
+    conn = await pool.acquire(write=write)
     try:
         yield conn
     finally:
-        conn.close()
\ No newline at end of file
+        await pool.release(conn, write=write)
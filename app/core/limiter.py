@@ -1,4 +1,10 @@
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+# Explicit in-process storage with fixed-window counting: one counter
+# increment per hit instead of the moving-window's per-hit log scan.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri="memory://",
+    strategy="fixed-window",
+)
@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 import os
 from fastapi import Security, HTTPException, status
 from fastapi.security.api_key import APIKeyHeader
@@ -6,12 +8,21 @@ API_KEY_NAME = "X-API-Key"
 # Load API Key from environment variable, default to "admin-secret" for dev only
 API_KEY = os.getenv("API_KEY", "admin-secret")
 
+# Digest computed once at import; comparing fixed-length hashes keeps the
+# check constant-time regardless of how much of the key matches.
+_API_KEY_DIGEST = hashlib.sha256(API_KEY.encode()).digest()
+
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=True)
 
+# The rejection never varies, so build it once instead of allocating a
+# fresh exception per failed attempt (scanners hit this path hard)
+_INVALID_KEY_EXC = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Could not validate credentials"
+)
+
 async def get_api_key(api_key_header: str = Security(api_key_header)):
-    if api_key_header == API_KEY:
+    candidate = hashlib.sha256(api_key_header.encode()).digest()
+    if hmac.compare_digest(candidate, _API_KEY_DIGEST):
         return api_key_header
-    raise HTTPException(
-        status_code=status.HTTP_403_FORBIDDEN,
-        detail="Could not validate credentials"
-    )
\ No newline at end of file
+    raise _INVALID_KEY_EXC
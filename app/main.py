@@ -1,10 +1,12 @@
 # uvicorn main:app --reload
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
-from app.core.database import init_db
+from app.core.database import init_db, pool
 from app.routers import notes
+import hashlib
+import json
 import os
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -12,10 +14,12 @@ from app.core.limiter import limiter
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize database on startup
-    init_db()
+    # Initialize database and connection pool on startup
+    await init_db()
+    await pool.open()
     yield
-    # Clean up resources on shutdown (if any)
+    # Close pooled connections on shutdown
+    await pool.close()
 
 app = FastAPI(
     title="The Knowledge Agora API",
@@ -49,7 +53,9 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Trusted Host Middleware
 # Prevents HTTP Host Header attacks. In production, set ALLOWED_HOSTS to your domain.
 # "testserver" is required for TestClient
-ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1,testserver").split(",")
+ALLOWED_HOSTS = tuple(
+    host.strip() for host in os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1,testserver").split(",")
+)
 app.add_middleware(
     TrustedHostMiddleware,
     allowed_hosts=ALLOWED_HOSTS
@@ -57,7 +63,9 @@ app.add_middleware(
 
 # CORS Middleware
 # Allows cross-origin requests. In production, restrict this to your frontend domain.
-ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+ALLOWED_ORIGINS = tuple(
+    origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
@@ -66,22 +74,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETag Middleware
+# Hashes successful GET bodies into a weak ETag; a matching If-None-Match
+# gets an empty 304 so unchanged responses cost no body bytes.
+@app.middleware("http")
+async def etag_middleware(request, call_next):
+    response = await call_next(request)
+    if request.method != "GET" or response.status_code != 200:
+        return response
+
+    body = b""
+    async for chunk in response.body_iterator:
+        body += chunk
+
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    headers = dict(response.headers)
+    headers["ETag"] = etag
+    return Response(content=body, status_code=response.status_code, headers=headers)
+
 # Include routers
 app.include_router(notes.router)
 
+# The root payload never changes, so serialize it once at import time
+_ROOT_PAYLOAD = json.dumps({
+    "message": "Welcome to The Knowledge Agora API",
+    "docs": "/docs",
+    "endpoints": {
+        "list_notes": "GET /notes",
+        "create_note": "POST /notes",
+        "read_note": "GET /notes/{id}",
+        "update_note": "PUT /notes/{id}",
+        "delete_note": "DELETE /notes/{id}",
+        "vote_note": "POST /notes/{id}/vote",
+        "top_notes": "GET /notes/top"
+    }
+}).encode()
+
 @app.get("/")
 def read_root():
     """Welcome message and instructions."""
-    return {
-        "message": "Welcome to The Knowledge Agora API",
-        "docs": "/docs",
-        "endpoints": {
-            "list_notes": "GET /notes",
-            "create_note": "POST /notes",
-            "read_note": "GET /notes/{id}",
-            "update_note": "PUT /notes/{id}",
-            "delete_note": "DELETE /notes/{id}",
-            "vote_note": "POST /notes/{id}/vote",
-            "top_notes": "GET /notes/top"
-        }
-    }
\ No newline at end of file
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
\ No newline at end of file
@@ -1,13 +1,103 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Optional
+import json
 from app.core.database import get_db
 from app.models.models import NoteCreate, NoteUpdate, NoteResponse
 from app.core.security import get_api_key
 from app.core.limiter import limiter
-import sqlite3
+from app.core.cache import top_notes_cache
+from itertools import combinations
 
 router = APIRouter(tags=["Notes"])
 
+# SQL is hoisted to module level so SQLite's per-connection statement
+# cache sees the same strings on every request instead of re-parsing
+# freshly built ones.
+_SQL_INSERT_NOTE = "INSERT INTO notes (topic, content, author) VALUES (?, ?, ?) RETURNING *"
+_SQL_SELECT_BY_ID = "SELECT * FROM notes WHERE id = ?"
+_SQL_TOP_NOTES = "SELECT * FROM notes ORDER BY votes DESC LIMIT 10"
+_SQL_DELETE_NOTE = "DELETE FROM notes WHERE id = ? RETURNING id"
+_SQL_VOTE_NOTE = "UPDATE notes SET votes = votes + ? WHERE id = ? RETURNING *"
+_SQL_PIN_NOTE = "UPDATE notes SET pinned = 1 WHERE id = ? RETURNING *"
+
+def _rows_response(rows):
+    """Serialize note rows straight to a JSON response.
+
+    Rows from the driver are trusted, so re-validating them through the
+    response model per request is wasted work. Only the two fields
+    whose raw SQLite form differs from the documented schema are
+    normalized: pinned (0/1 -> bool) and created_at (space -> 'T').
+    """
+    for row in rows:
+        row["pinned"] = bool(row["pinned"])
+        created_at = row["created_at"]
+        if isinstance(created_at, str):
+            row["created_at"] = created_at.replace(" ", "T", 1)
+    return Response(content=json.dumps(rows), media_type="application/json")
+
+def _build_list_queries():
+    """Precompute the 8 filter combinations used by GET /notes.
+
+    Keys are (has_topic, has_author, has_search). Parameter order is:
+    search term first (when present), then topic, then author.
+    """
+    queries = {}
+    for has_topic in (False, True):
+        for has_author in (False, True):
+            for has_search in (False, True):
+                if has_search:
+                    query = (
+                        "SELECT n.* FROM notes n JOIN notes_fts f ON n.id = f.rowid"
+                        " WHERE notes_fts MATCH ?"
+                    )
+                else:
+                    query = "SELECT * FROM notes n WHERE 1=1"
+                if has_topic:
+                    query += " AND n.topic = ?"
+                if has_author:
+                    query += " AND n.author = ?"
+                if has_search:
+                    query += " ORDER BY bm25(notes_fts)"
+                else:
+                    # Pinned notes surface first, newest first within each group
+                    query += " ORDER BY n.pinned DESC, n.created_at DESC"
+                query += " LIMIT ? OFFSET ?"
+                queries[(has_topic, has_author, has_search)] = query
+    return queries
+
+_SQL_LIST_NOTES = _build_list_queries()
+
+def _build_keyset_queries():
+    """Precompute the keyset (after_id) variants of the listing query.
+
+    Paging by id > ? costs O(limit) at any depth, unlike OFFSET which
+    reads and discards every skipped row. Keyset pages are id-ordered.
+    """
+    queries = {}
+    for has_topic in (False, True):
+        for has_author in (False, True):
+            query = "SELECT * FROM notes n WHERE n.id > ?"
+            if has_topic:
+                query += " AND n.topic = ?"
+            if has_author:
+                query += " AND n.author = ?"
+            query += " ORDER BY n.id LIMIT ?"
+            queries[(has_topic, has_author)] = query
+    return queries
+
+_SQL_LIST_NOTES_KEYSET = _build_keyset_queries()
+
+# One UPDATE statement per non-empty subset of updatable columns
+_SQL_UPDATE_NOTE = {
+    fields: (
+        "UPDATE notes SET "
+        + ", ".join(f"{field} = ?" for field in fields)
+        + " WHERE id = ? RETURNING *"
+    )
+    for size in range(1, 4)
+    for fields in combinations(("topic", "content", "author"), size)
+}
+
 @router.post(
     "/notes",
     response_model=NoteResponse,
@@ -16,26 +106,22 @@ router = APIRouter(tags=["Notes"])
     description="Add a new note to the Agora. You can optionally provide an author name."
 )
 @limiter.limit("10/minute")
-def create_note(request: Request, note: NoteCreate, conn=Depends(get_db)):
+async def create_note(request: Request, note: NoteCreate, conn=Depends(get_db)):
     """
     Create a new note with the following information:
-    
+
     - **topic**: The topic of the note
     - **content**: The main content
     - **author**: (Optional) The author's nickname (defaults to 'Anonymous')
     """
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO notes (topic, content, author) VALUES (?, ?, ?)",
+    cursor = await conn.execute(
+        _SQL_INSERT_NOTE,
         (note.topic, note.content, note.author)
     )
-    note_id = cursor.lastrowid
-    conn.commit()
-    
-    # Fetch the created note
-    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
-    new_note = cursor.fetchone()
-    return dict(new_note)
+    new_note = await cursor.fetchone()
+    await conn.commit()
+    top_notes_cache.clear()
+    return new_note
 
 @router.get(
     "/notes",
@@ -44,32 +130,59 @@ def create_note(request: Request, note: NoteCreate, conn=Depends(get_db)):
     description="Retrieve a list of notes with optional filtering and searching."
 )
 @limiter.limit("100/minute")
-def read_notes(
+async def read_notes(
     request: Request,
     topic: Optional[str] = Query(None, description="Filter by exact topic"),
     author: Optional[str] = Query(None, description="Filter by author name"),
     search: Optional[str] = Query(None, description="Search for keywords in the content"),
+    ids: Optional[str] = Query(None, description="Comma-separated note IDs to fetch in one request"),
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset pagination: return notes with id greater than this, ordered by id"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of notes to return"),
+    offset: int = Query(0, ge=0, description="Number of notes to skip"),
     conn=Depends(get_db)
 ):
-    query = "SELECT * FROM notes WHERE 1=1"
-    params = []
+    if ids:
+        # Batched fetch: one round trip instead of one GET per note
+        try:
+            id_list = [int(part) for part in ids.split(",") if part.strip()]
+        except ValueError:
+            raise HTTPException(status_code=422, detail="ids must be comma-separated integers")
+        if len(id_list) > 200:
+            raise HTTPException(status_code=422, detail="At most 200 ids per request")
+        placeholders = ",".join("?" * len(id_list))
+        cursor = await conn.execute(
+            f"SELECT * FROM notes WHERE id IN ({placeholders}) ORDER BY id", id_list
+        )
+        return _rows_response(await cursor.fetchall())
+
+    if after_id is not None and not search:
+        query = _SQL_LIST_NOTES_KEYSET[(bool(topic), bool(author))]
+        params = [after_id]
+        if topic:
+            params.append(topic)
+        if author:
+            params.append(author)
+        params.append(limit)
+        cursor = await conn.execute(query, params)
+        return _rows_response(await cursor.fetchall())
 
+    query = _SQL_LIST_NOTES[(bool(topic), bool(author), bool(search))]
+    params = []
+    if search:
+        # Indexed full-text match over content, ranked by relevance.
+        # The term is quoted as a phrase so FTS5 operators in user input
+        # cannot change the query.
+        escaped = search.replace('"', '""')
+        params.append(f'content:"{escaped}"')
     if topic:
-        query += " AND topic = ?"
         params.append(topic)
     if author:
-        query += " AND author = ?"
         params.append(author)
-    if search:
-        query += " AND content LIKE ?"
-        params.append(f"%{search}%")
-    
-    query += " ORDER BY created_at DESC"
+    params.extend((limit, offset))
 
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    notes = cursor.fetchall()
-    return [dict(note) for note in notes]
+    cursor = await conn.execute(query, params)
+    notes = await cursor.fetchall()
+    return _rows_response(notes)
 
 @router.get(
     "/notes/top",
@@ -77,11 +190,17 @@ def read_notes(
     summary="Get top voted notes",
     description="Retrieve the top 10 notes with the highest number of votes."
 )
-def get_top_notes(conn=Depends(get_db)):
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM notes ORDER BY votes DESC LIMIT 10")
-    notes = cursor.fetchall()
-    return [dict(note) for note in notes]
+async def get_top_notes(conn=Depends(get_db)):
+    cached = top_notes_cache.get()
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    cursor = await conn.execute(_SQL_TOP_NOTES)
+    notes = await cursor.fetchall()
+    response = _rows_response(notes)
+    # Cache the serialized bytes so repeat hits skip SQLite and JSON work
+    top_notes_cache.set(response.body)
+    return response
 
 @router.get(
     "/notes/{note_id}",
@@ -89,13 +208,12 @@ def get_top_notes(conn=Depends(get_db)):
     summary="Get a specific note",
     description="Retrieve details of a specific note by its ID."
 )
-def read_note(note_id: int, conn=Depends(get_db)):
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
-    note = cursor.fetchone()
+async def read_note(note_id: int, conn=Depends(get_db)):
+    cursor = await conn.execute(_SQL_SELECT_BY_ID, (note_id,))
+    note = await cursor.fetchone()
     if note is None:
         raise HTTPException(status_code=404, detail="Note not found")
-    return dict(note)
+    return note
 
 @router.put(
     "/notes/{note_id}",
@@ -103,42 +221,39 @@ def read_note(note_id: int, conn=Depends(get_db)):
     summary="Update a note",
     description="Update the topic, content, or author of an existing note."
 )
-def update_note(note_id: int, note_update: NoteUpdate, conn=Depends(get_db)):
-    cursor = conn.cursor()
-    
-    # Check if note exists
-    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
-    existing_note = cursor.fetchone()
-    if existing_note is None:
-        raise HTTPException(status_code=404, detail="Note not found")
-    
-    # Build update query dynamically
+async def update_note(note_id: int, note_update: NoteUpdate, conn=Depends(get_db)):
+    # Look up the precomputed UPDATE for the set of provided fields
     update_fields = []
     params = []
-    
+
     if note_update.topic is not None:
-        update_fields.append("topic = ?")
+        update_fields.append("topic")
         params.append(note_update.topic)
     if note_update.content is not None:
-        update_fields.append("content = ?")
+        update_fields.append("content")
         params.append(note_update.content)
     if note_update.author is not None:
-        update_fields.append("author = ?")
+        update_fields.append("author")
         params.append(note_update.author)
-        
+
     if not update_fields:
-        return dict(existing_note)
-        
+        # Nothing to change, just return the current row
+        cursor = await conn.execute(_SQL_SELECT_BY_ID, (note_id,))
+        existing_note = await cursor.fetchone()
+        if existing_note is None:
+            raise HTTPException(status_code=404, detail="Note not found")
+        return existing_note
+
     params.append(note_id)
-    query = f"UPDATE notes SET {', '.join(update_fields)} WHERE id = ?"
-    
-    cursor.execute(query, params)
-    conn.commit()
-    
-    # Return updated note
-    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
-    updated_note = cursor.fetchone()
-    return dict(updated_note)
+    query = _SQL_UPDATE_NOTE[tuple(update_fields)]
+
+    cursor = await conn.execute(query, params)
+    updated_note = await cursor.fetchone()
+    await conn.commit()
+    top_notes_cache.clear()
+    if updated_note is None:
+        raise HTTPException(status_code=404, detail="Note not found")
+    return updated_note
 
 @router.post(
     "/notes/{note_id}/pin",
@@ -146,20 +261,14 @@ def update_note(note_id: int, note_update: NoteUpdate, conn=Depends(get_db)):
     summary="Pin a note",
     description="Mark a note as pinned to highlight it."
 )
-def pin_note(note_id: int, conn=Depends(get_db)):
-    cursor = conn.cursor()
-    
-    # Check if note exists
-    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
-    if cursor.fetchone() is None:
+async def pin_note(note_id: int, conn=Depends(get_db)):
+    cursor = await conn.execute(_SQL_PIN_NOTE, (note_id,))
+    updated_note = await cursor.fetchone()
+    await conn.commit()
+    top_notes_cache.clear()
+    if updated_note is None:
         raise HTTPException(status_code=404, detail="Note not found")
-        
-    cursor.execute("UPDATE notes SET pinned = 1 WHERE id = ?", (note_id,))
-    conn.commit()
-    
-    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
-    updated_note = cursor.fetchone()
-    return dict(updated_note)
+    return updated_note
 
 @router.delete(
     "/notes/{note_id}",
@@ -167,12 +276,13 @@ def pin_note(note_id: int, conn=Depends(get_db)):
     description="Permanently remove a note. **Requires Admin API Key**.",
     responses={403: {"description": "Not authenticated"}}
 )
-def delete_note(note_id: int, conn=Depends(get_db), api_key: str = Depends(get_api_key)):
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
-    if cursor.rowcount == 0:
+async def delete_note(note_id: int, conn=Depends(get_db), api_key: str = Depends(get_api_key)):
+    cursor = await conn.execute(_SQL_DELETE_NOTE, (note_id,))
+    deleted = await cursor.fetchone()
+    await conn.commit()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Note not found")
-    conn.commit()
+    top_notes_cache.clear()
     return {"message": "Note deleted successfully"}
 
 @router.post(
@@ -181,17 +291,15 @@ def delete_note(note_id: int, conn=Depends(get_db), api_key: str = Depends(get_a
     summary="Vote for a note",
     description="Increment the vote count for a specific note."
 )
-def vote_note(note_id: int, conn=Depends(get_db)):
-    cursor = conn.cursor()
-    
-    # Check if note exists
-    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
-    if cursor.fetchone() is None:
+async def vote_note(
+    note_id: int,
+    count: int = Query(1, ge=1, le=100, description="Number of votes to add in one request"),
+    conn=Depends(get_db)
+):
+    cursor = await conn.execute(_SQL_VOTE_NOTE, (count, note_id))
+    updated_note = await cursor.fetchone()
+    await conn.commit()
+    top_notes_cache.clear()
+    if updated_note is None:
         raise HTTPException(status_code=404, detail="Note not found")
-        
-    cursor.execute("UPDATE notes SET votes = votes + 1 WHERE id = ?", (note_id,))
-    conn.commit()
-    
-    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
-    updated_note = cursor.fetchone()
-    return dict(updated_note)
\ No newline at end of file
+    return updated_note
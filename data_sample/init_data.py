@@ -1,3 +1,4 @@
+import asyncio
 import sqlite3
 import os
 import sys
@@ -68,7 +69,7 @@ SAMPLE_NOTES = [
 
 def init_sample_data():
     # Ensure table exists
-    init_db()
+    asyncio.run(init_db())
     
     print(f"Connecting to {DATABASE_NAME}...")
     conn = sqlite3.connect(DATABASE_NAME)
@@ -78,12 +79,16 @@ def init_sample_data():
     cursor.execute("DELETE FROM notes")
     
     print("Inserting sample notes...")
-    for note in SAMPLE_NOTES:
-        cursor.execute('''
-            INSERT INTO notes (topic, content, author, votes, pinned)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (note["topic"], note["content"], note["author"], note["votes"], note["pinned"]))
-    
+    # Generator feeds executemany row by row without materializing a list
+    rows = (
+        (note["topic"], note["content"], note["author"], note["votes"], note["pinned"])
+        for note in SAMPLE_NOTES
+    )
+    cursor.executemany('''
+        INSERT INTO notes (topic, content, author, votes, pinned)
+        VALUES (?, ?, ?, ?, ?)
+    ''', rows)
+
     conn.commit()
     print(f"Successfully inserted {len(SAMPLE_NOTES)} notes.")
     conn.close()
@@ -1,46 +1,108 @@
 import pytest
 from fastapi.testclient import TestClient
 import sqlite3
+import aiosqlite
 from app.main import app
-from app.core.database import get_db
+from app.core.database import get_db, dict_row_factory, SCHEMA_STATEMENTS
 from app.core.limiter import limiter
+from app.core.cache import top_notes_cache
 
 # Disable rate limiting for tests
 limiter.enabled = False
 
-# Override the database dependency for testing
-@pytest.fixture(name="client")
-def client_fixture():
-    # Create an in-memory database for testing
-    conn = sqlite3.connect(":memory:", check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    
-    # Initialize the schema
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            topic TEXT NOT NULL,
-            content TEXT NOT NULL,
-            author TEXT DEFAULT 'Anonymous',
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            votes INTEGER DEFAULT 0,
-            pinned BOOLEAN DEFAULT 0
-        )
-    ''')
-    conn.commit()
+# Named in-memory database shared between connections. The sync "keeper"
+# connection holds it alive for the whole session while the app opens
+# its own aiosqlite connections against the same URI.
+TEST_DATABASE_URI = "file:test_agora?mode=memory&cache=shared"
+
+def ok(response, code=200):
+    """Assert the status code and return the decoded JSON body."""
+    assert response.status_code == code, response.text
+    return response.json()
+
+@pytest.fixture(name="test_db", scope="session")
+def test_db_fixture():
+    """Create the shared in-memory database and its schema once per session."""
+    keeper = sqlite3.connect(TEST_DATABASE_URI, uri=True, check_same_thread=False)
+    keeper.row_factory = sqlite3.Row
+
+    # In-memory test database: skip the durability work entirely
+    keeper.execute("PRAGMA synchronous=OFF")
+    keeper.execute("PRAGMA journal_mode=MEMORY")
+    keeper.execute("PRAGMA temp_store=MEMORY")
 
+    # Initialize the schema (same statements the app runs on startup)
+    for statement in SCHEMA_STATEMENTS:
+        keeper.execute(statement)
+    keeper.commit()
+
+    yield keeper
+    keeper.close()
+
+# Override the database dependency for testing
+@pytest.fixture(name="client", scope="session")
+def client_fixture(test_db):
     # Define the dependency override
-    def get_test_db():
-        yield conn
+    async def get_test_db():
+        async with aiosqlite.connect(TEST_DATABASE_URI, uri=True) as conn:
+            conn.row_factory = dict_row_factory
+            yield conn
 
     # Apply the override
     app.dependency_overrides[get_db] = get_test_db
-    
-    # Create the test client
-    client = TestClient(app)
+
+    # One client (and its ASGI transport) for the whole session; unhandled
+    # server errors surface as 500 responses so ok() can report them
+    client = TestClient(app, raise_server_exceptions=False)
     yield client
-    
+
     # Clean up
     app.dependency_overrides.clear()
-    conn.close()
\ No newline at end of file
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup(client):
+    """One throwaway request so the first real test doesn't pay FastAPI's
+    first-request costs (route resolution, validator warm-up)."""
+    client.get("/notes")
+
+@pytest.fixture(name="created_note")
+def created_note_fixture(test_db):
+    """A freshly created note for tests that act on an existing note.
+
+    Inserted directly rather than via POST /notes: the create endpoint has
+    its own tests, and setup shouldn't pay for an HTTP round-trip.
+    """
+    cursor = test_db.execute(
+        "INSERT INTO notes (topic, content) VALUES (?, ?) RETURNING *",
+        ("Fixture Note", "Fixture content")
+    )
+    row = dict(cursor.fetchone())
+    test_db.commit()
+    return row
+
+@pytest.fixture(name="seed_notes")
+def seed_notes_fixture(test_db):
+    """Bulk-insert notes directly, for tests that only exercise reads.
+
+    Takes (topic, votes) pairs and returns a topic -> id mapping.
+    """
+    def seed(specs):
+        test_db.executemany(
+            "INSERT INTO notes (topic, content, votes) VALUES (?, ?, ?)",
+            [(topic, topic, votes) for topic, votes in specs]
+        )
+        test_db.commit()
+        rows = test_db.execute("SELECT id, topic FROM notes ORDER BY id").fetchall()
+        return {row["topic"]: row["id"] for row in rows}
+    return seed
+
+@pytest.fixture(autouse=True)
+def _reset_db(test_db):
+    """Give every test a pristine database without recreating the schema."""
+    top_notes_cache.clear()
+    yield
+    # Emptying the table cascades into the FTS index via the triggers;
+    # resetting the sequence keeps note ids deterministic per test
+    test_db.execute("DELETE FROM notes")
+    test_db.execute("DELETE FROM sqlite_sequence WHERE name = 'notes'")
+    test_db.commit()
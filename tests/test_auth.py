@@ -1,43 +1,29 @@
 import pytest
 
 API_KEY = "admin-secret"
+_ADMIN_HEADERS = {"X-API-Key": API_KEY}
 
-def test_delete_note_no_auth(client):
-    # Create a note first
-    create_response = client.post("/notes", json={"topic": "To Delete", "content": "..."})
-    note_id = create_response.json()["id"]
-    
+def test_delete_note_no_auth(client, created_note):
     # Try to delete without auth header
-    response = client.delete(f"/notes/{note_id}")
+    response = client.delete(f"/notes/{created_note['id']}")
     assert response.status_code == 403
     assert response.json() == {"detail": "Not authenticated"}
 
-def test_delete_note_invalid_auth(client):
-    # Create a note first
-    create_response = client.post("/notes", json={"topic": "To Delete", "content": "..."})
-    note_id = create_response.json()["id"]
-    
+def test_delete_note_invalid_auth(client, created_note):
     # Try to delete with wrong key
     response = client.delete(
-        f"/notes/{note_id}",
+        f"/notes/{created_note['id']}",
         headers={"X-API-Key": "wrong-key"}
     )
     assert response.status_code == 403
     assert response.json() == {"detail": "Could not validate credentials"}
 
-def test_delete_note_valid_auth(client):
-    # Create a note first
-    create_response = client.post("/notes", json={"topic": "To Delete", "content": "..."})
-    note_id = create_response.json()["id"]
-    
+def test_delete_note_valid_auth(client, created_note):
     # Delete with correct key
-    response = client.delete(
-        f"/notes/{note_id}",
-        headers={"X-API-Key": API_KEY}
-    )
+    response = client.delete(f"/notes/{created_note['id']}", headers=_ADMIN_HEADERS)
     assert response.status_code == 200
     assert response.json() == {"message": "Note deleted successfully"}
-    
+
     # Verify it's gone
-    get_response = client.get(f"/notes/{note_id}")
-    assert get_response.status_code == 404
\ No newline at end of file
+    get_response = client.get(f"/notes/{created_note['id']}")
+    assert get_response.status_code == 404
@@ -1,101 +1,105 @@
+import json
+
+import pytest
+
+from tests.conftest import ok
+
+# Request bodies and headers built once at import instead of on every call
+_JSON_HEADERS = {"content-type": "application/json"}
+_ADMIN_HEADERS = {"X-API-Key": "admin-secret"}
+_CREATE_BODY = json.dumps(
+    {"topic": "Test Note", "content": "This is a test note", "author": "Tester"}
+).encode()
+_ANONYMOUS_BODY = json.dumps({"topic": "Anonymous Note", "content": "Content"}).encode()
+_LIST_BODIES = tuple(
+    json.dumps({"topic": f"Note {i}", "content": f"Content {i}"}).encode()
+    for i in (1, 2)
+)
+
 def test_create_note(client):
-    response = client.post(
-        "/notes",
-        json={"topic": "Test Note", "content": "This is a test note", "author": "Tester"}
-    )
-    assert response.status_code == 201
-    data = response.json()
-    assert data["topic"] == "Test Note"
-    assert data["content"] == "This is a test note"
-    assert data["author"] == "Tester"
-    assert "id" in data
-    assert "created_at" in data
-    assert data["votes"] == 0
+    data = ok(client.post("/notes", content=_CREATE_BODY, headers=_JSON_HEADERS), 201)
+    assert {"id", "created_at"} <= data.keys()
+    assert {k: data[k] for k in ("topic", "content", "author", "votes")} == {
+        "topic": "Test Note",
+        "content": "This is a test note",
+        "author": "Tester",
+        "votes": 0,
+    }
 
 def test_create_note_default_author(client):
-    response = client.post(
-        "/notes",
-        json={"topic": "Anonymous Note", "content": "Content"}
-    )
-    assert response.status_code == 201
-    assert response.json()["author"] == "Anonymous"
+    data = ok(client.post("/notes", content=_ANONYMOUS_BODY, headers=_JSON_HEADERS), 201)
+    assert data["author"] == "Anonymous"
 
 def test_read_notes(client):
     # Create two notes
-    client.post("/notes", json={"topic": "Note 1", "content": "Content 1"})
-    client.post("/notes", json={"topic": "Note 2", "content": "Content 2"})
-    
-    response = client.get("/notes")
-    assert response.status_code == 200
-    assert len(response.json()) == 2
-
-def test_read_note_by_id(client):
-    create_response = client.post("/notes", json={"topic": "Target", "content": "Target Content"})
-    note_id = create_response.json()["id"]
-    
-    response = client.get(f"/notes/{note_id}")
-    assert response.status_code == 200
-    assert response.json()["topic"] == "Target"
-
-def test_read_note_not_found(client):
-    response = client.get("/notes/999")
+    for body in _LIST_BODIES:
+        client.post("/notes", content=body, headers=_JSON_HEADERS)
+
+
+    assert len(ok(client.get("/notes"))) == 2
+
+def test_read_notes_by_ids(client):
+    id1 = client.post("/notes", json={"topic": "A", "content": "a"}).json()["id"]
+    client.post("/notes", json={"topic": "B", "content": "b"})
+    id3 = client.post("/notes", json={"topic": "C", "content": "c"}).json()["id"]
+
+    notes = ok(client.get("/notes", params={"ids": f"{id1},{id3}"}))
+    assert [note["topic"] for note in notes] == ["A", "C"]
+
+def test_search_notes(client):
+    client.post("/notes", json={"topic": "Cooking", "content": "How to bake sourdough bread"})
+    client.post("/notes", json={"topic": "Coding", "content": "How to write unit tests"})
+
+    results = ok(client.get("/notes", params={"search": "sourdough"}))
+    assert len(results) == 1
+    assert results[0]["topic"] == "Cooking"
+
+def test_read_note_by_id(client, created_note):
+    data = ok(client.get(f"/notes/{created_note['id']}"))
+    assert data["topic"] == created_note["topic"]
+
+@pytest.mark.parametrize("method,path,body", [
+    ("get", "/notes/999", None),
+    ("put", "/notes/999", {"topic": "New"}),
+    ("post", "/notes/999/vote", None),
+    ("post", "/notes/999/pin", None),
+])
+def test_missing_note_returns_404(client, method, path, body):
+    kwargs = {"json": body} if body is not None else {}
+    response = getattr(client, method)(path, **kwargs)
     assert response.status_code == 404
 
-def test_update_note(client):
-    create_response = client.post("/notes", json={"topic": "Old", "content": "Old Content"})
-    note_id = create_response.json()["id"]
-    
-    response = client.put(
-        f"/notes/{note_id}",
+def test_update_note(client, created_note):
+    data = ok(client.put(
+        f"/notes/{created_note['id']}",
         json={"topic": "New", "content": "New Content"}
-    )
-    assert response.status_code == 200
-    data = response.json()
-    assert data["topic"] == "New"
-    assert data["content"] == "New Content"
-
-def test_delete_note(client):
-    create_response = client.post("/notes", json={"topic": "To Delete", "content": "..."})
-    note_id = create_response.json()["id"]
-    
-    response = client.delete(
-        f"/notes/{note_id}",
-        headers={"X-API-Key": "admin-secret"}
-    )
-    assert response.status_code == 200
-    
+    ))
+    assert (data["topic"], data["content"]) == ("New", "New Content")
+
+def test_delete_note(client, created_note):
+    note_id = created_note["id"]
+
+    ok(client.delete(f"/notes/{note_id}", headers=_ADMIN_HEADERS))
+
+
     # Verify it's gone
     get_response = client.get(f"/notes/{note_id}")
     assert get_response.status_code == 404
 
-def test_vote_note(client):
-    create_response = client.post("/notes", json={"topic": "Vote Me", "content": "..."})
-    note_id = create_response.json()["id"]
-    
-    response = client.post(f"/notes/{note_id}/vote")
-    assert response.status_code == 200
-    assert response.json()["votes"] == 1
-    
-    # Vote again
-    response = client.post(f"/notes/{note_id}/vote")
-    assert response.json()["votes"] == 2
-
-def test_top_notes(client):
-    # Create 3 notes
-    id1 = client.post("/notes", json={"topic": "1", "content": "1"}).json()["id"]
-    id2 = client.post("/notes", json={"topic": "2", "content": "2"}).json()["id"]
-    id3 = client.post("/notes", json={"topic": "3", "content": "3"}).json()["id"]
-    
-    # Vote for note 2 twice
-    client.post(f"/notes/{id2}/vote")
-    client.post(f"/notes/{id2}/vote")
-    
-    # Vote for note 1 once
-    client.post(f"/notes/{id1}/vote")
-    
-    response = client.get("/notes/top")
-    data = response.json()
-    
+def test_vote_note(client, created_note):
+    note_id = created_note["id"]
+
+    assert ok(client.post(f"/notes/{note_id}/vote"))["votes"] == 1
+
+    # Batched votes land in one request
+    assert ok(client.post(f"/notes/{note_id}/vote", params={"count": 2}))["votes"] == 3
+
+def test_top_notes(client, seed_notes):
+    # Seed 3 notes with vote counts in one insert
+    ids = seed_notes([("1", 1), ("2", 2), ("3", 0)])
+
+    data = ok(client.get("/notes/top"))
+
     assert len(data) >= 3
-    assert data[0]["id"] == id2  # Most votes
-    assert data[1]["id"] == id1  # Second most
\ No newline at end of file
+    assert data[0]["id"] == ids["2"]  # Most votes
+    assert data[1]["id"] == ids["1"]  # Second most
\ No newline at end of file